@@ -0,0 +1,36 @@
+"""
+Shared on-disk response cache for the pipeline scripts.
+
+Each entry is one file, <cache_dir>/<key><suffix>. Callers choose the suffix and how
+values are (de)serialized; entries are written atomically via a temp file + os.replace.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+
+def cache_get(cache_dir: Path, key: str, suffix: str,
+              loads: Callable[[str], Any] = str) -> Any | None:
+    path = cache_dir / f"{key}{suffix}"
+    return loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def cache_put(cache_dir: Path, key: str, value: Any, suffix: str,
+              dumps: Callable[[Any], str] = str) -> None:
+    """Write atomically so concurrent workers never see a partial entry."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    text = dumps(value)
+    f = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=cache_dir, suffix=".tmp", delete=False)
+    try:
+        with f:
+            f.write(text)
+        os.replace(f.name, cache_dir / f"{key}{suffix}")
+    except BaseException:
+        Path(f.name).unlink(missing_ok=True)
+        raise
+
+
+def cache_delete(cache_dir: Path, key: str, suffix: str) -> None:
+    (cache_dir / f"{key}{suffix}").unlink(missing_ok=True)
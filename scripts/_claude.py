@@ -0,0 +1,8 @@
+"""
+Claude API settings shared by ocr.py and extract.py.
+"""
+
+# Concurrent pages can trip rate limits in bursts, and an extraction is one long call
+# per pattern. The SDK retries 408/409/429/5xx with exponential backoff, jitter and
+# Retry-After; allow more attempts than its default of 2.
+MAX_RETRIES = 5
@@ -0,0 +1,22 @@
+"""
+Shared .env loader for the pipeline scripts.
+
+Reads KEY=VALUE lines from the project-root .env into os.environ without
+overriding variables that are already set. Blank lines and # comments are skipped.
+"""
+
+import os
+from pathlib import Path
+
+ENV_PATH = Path(__file__).parent.parent / ".env"
+
+
+def load_dotenv(path: Path = ENV_PATH) -> None:
+    if not path.exists():
+        return
+    with path.open() as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                k, v = line.split("=", 1)
+                os.environ.setdefault(k.strip(), v.strip())
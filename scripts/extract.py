@@ -11,9 +11,10 @@ Output:
 Example:
   python scripts/extract.py 076_text.json
 
-The output is the human-in-the-loop checkpoint. Review and edit it before running upload.py.
+The output is the human-in-the-loop checkpoint. Review and edit it before loading it into visualize.html.
 """
 
+import hashlib
 import json
 import logging
 import os
@@ -21,20 +22,24 @@ import sys
 from pathlib import Path
 
 # Load .env from project root
-_env_path = Path(__file__).parent.parent / ".env"
-if _env_path.exists():
-    for _line in _env_path.read_text().splitlines():
-        _line = _line.strip()
-        if _line and not _line.startswith("#") and "=" in _line:
-            _k, _v = _line.split("=", 1)
-            os.environ.setdefault(_k.strip(), _v.strip())
+from _env import load_dotenv
+load_dotenv()
+
+from _cache import cache_get, cache_put
+from _claude import MAX_RETRIES
 
 import anthropic
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-client = anthropic.Anthropic()
+MODEL      = "claude-sonnet-4-6"
+MAX_TOKENS = 4000
+
+client = anthropic.Anthropic(max_retries=MAX_RETRIES)
+
+# Extractions keyed by SHA-256 of the full request — unchanged text and prompt skip the Claude call
+CACHE_DIR = Path.home() / ".cache" / "claude_vision" / "knowledge"
 
 SYSTEM_PROMPT = """\
 You are an architectural knowledge extraction specialist working with Christopher Alexander's \
@@ -122,17 +127,32 @@ SCHEMA_EXAMPLE = """\
 """
 
 
-def extract_knowledge(text_json_path: str) -> dict:
+def _cache_get(key: str) -> dict | None:
+    return cache_get(CACHE_DIR, key, ".json", json.loads)
+
+
+def _cache_put(key: str, knowledge: dict) -> None:
+    cache_put(CACHE_DIR, key, knowledge, ".json", json.dumps)
+
+
+def extract_knowledge(text_json_path: str, refresh: bool = False) -> dict:
     with open(text_json_path) as f:
         data = json.load(f)
+    return extract_knowledge_from_data(data, source=text_json_path, refresh=refresh)
+
+
+def extract_knowledge_from_data(data: dict, source: str = "text data", refresh: bool = False) -> dict:
+    """Same as extract_knowledge, for callers that already hold the _text.json dict in memory.
 
+    refresh=True ignores a cached extraction and overwrites it with the new result.
+    """
     pattern_name   = data["pattern_name"]
     pattern_number = data["pattern_number"]
     # support both new (full_text) and legacy (transcribed_text_with_images) field names
     full_text = data.get("full_text") or data.get("transcribed_text_with_images", "")
 
     if not full_text:
-        raise ValueError(f"No text content found in {text_json_path}")
+        raise ValueError(f"No text content found in {source}")
 
     user_prompt = f"""\
 Extract structured knowledge from Pattern {pattern_number} — {pattern_name}.
@@ -158,20 +178,31 @@ Rules:
 Include pattern_name and pattern_number at the top level of the JSON.\
 """
 
+    # Key on the full request, so prompt, schema, model or max_tokens edits invalidate old extractions
+    cache_key = hashlib.sha256(
+        "\0".join([MODEL, str(MAX_TOKENS), SYSTEM_PROMPT, user_prompt]).encode("utf-8")
+    ).hexdigest()
+    cached = None if refresh else _cache_get(cache_key)
+    if cached is not None:
+        logger.info(f"Cached extraction for pattern {pattern_number} — {pattern_name}")
+        return cached
+
     logger.info(f"Calling Claude for pattern {pattern_number} — {pattern_name} ...")
-    message = client.messages.create(
-        model="claude-sonnet-4-6",
-        max_tokens=4000,
+    # Stream so the connection stays active through a long generation and the text is
+    # accumulated as it arrives, rather than buffered into one final response object.
+    with client.messages.stream(
+        model=MODEL,
+        max_tokens=MAX_TOKENS,
         system=SYSTEM_PROMPT,
         messages=[{"role": "user", "content": user_prompt}],
-    )
-
-    raw = message.content[0].text.strip()
+    ) as stream:
+        raw = "".join(stream.text_stream).strip()
 
     # Strip markdown code fences if Claude wrapped the JSON
     if raw.startswith("```"):
-        lines = raw.split("\n")
-        raw = "\n".join(lines[1:-1] if lines[-1].strip() == "```" else lines[1:])
+        start = raw.find("\n") + 1
+        end   = -3 if raw.endswith("```") and len(raw) - 3 >= start else None
+        raw   = raw[start:end].strip()
 
     try:
         knowledge = json.loads(raw)
@@ -184,6 +215,7 @@ Include pattern_name and pattern_number at the top level of the JSON.\
     knowledge["pattern_name"]   = pattern_name
     knowledge["pattern_number"] = pattern_number
 
+    _cache_put(cache_key, knowledge)
     return knowledge
 
 
@@ -206,12 +238,12 @@ def main():
 
     print(f"\nExtraction complete.")
     print(f"Output: {out_path}")
-    print(f"\nReview this file before uploading:")
+    print(f"\nReview this file before loading it into the graph:")
     print(f"  - Verify verbatim problem/solution statements")
     print(f"  - Check all forces have both poles")
     print(f"  - Confirm invariant rules have no hedging language")
     print(f"  - Verify adjacency_rules captures numbered cross-references")
-    print(f"\nThen run:  python scripts/upload.py {out_path}")
+    print(f"\nThen reload visualize.html.")
 
 
 if __name__ == "__main__":
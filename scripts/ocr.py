@@ -12,33 +12,86 @@ Example:
   python scripts/ocr.py scans/ "House for a Small Family" 76
 """
 
+import asyncio
 import base64
+import hashlib
+import io
 import json
 import logging
 import os
+import re
 import sys
 from pathlib import Path
 
 # Load .env from project root
-_env_path = Path(__file__).parent.parent / ".env"
-if _env_path.exists():
-    for _line in _env_path.read_text().splitlines():
-        _line = _line.strip()
-        if _line and not _line.startswith("#") and "=" in _line:
-            _k, _v = _line.split("=", 1)
-            os.environ.setdefault(_k.strip(), _v.strip())
+from _env import load_dotenv
+load_dotenv()
+
+from _cache import cache_delete, cache_get, cache_put
+from _claude import MAX_RETRIES
 
 import anthropic
+from PIL import ExifTags, Image, ImageOps
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-client = anthropic.Anthropic()
+# Concurrent Vision requests share the SDK's keep-alive pool (anthropic.DEFAULT_CONNECTION_LIMITS)
+# so each page reuses a warm TLS connection. HTTP/2 multiplexing is used when `h2` is installed.
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+MODEL      = "claude-sonnet-4-6"
+MAX_TOKENS = 2000
+
+MAX_WORKERS = 8
+
+# Transcriptions keyed by SHA-256 of the scan bytes plus PROMPT_VERSION — re-runs skip the Vision call
+CACHE_DIR = Path.home() / ".cache" / "claude_vision"
+
+_BLOCKED_TEXT = "[PAGE BLOCKED BY CONTENT FILTER — text not available]"
+
+# Claude Vision resizes anything larger server-side, so bigger uploads only cost bandwidth
+MAX_IMAGE_EDGE = 1568
+JPEG_QUALITY   = 85
+
+
+def encode_image_for_claude(image_bytes: bytes) -> str:
+    """Base64-encode a scan, downscaling it to MAX_IMAGE_EDGE on the long side first.
+
+    The caller's bytes are the only raw copy held: the resized JPEG is encoded straight
+    from the BytesIO buffer, and base64 output is ASCII so decoding is a plain byte copy.
+    EXIF orientation is baked into the pixels, since re-encoding drops the tag.
+    """
+    img     = Image.open(io.BytesIO(image_bytes))
+    upright = img.getexif().get(ExifTags.Base.Orientation, 1) == 1
+    if upright and max(img.size) <= MAX_IMAGE_EDGE:
+        return base64.b64encode(image_bytes).decode("ascii")
+
+    img = ImageOps.exif_transpose(img)
+    img.thumbnail((MAX_IMAGE_EDGE, MAX_IMAGE_EDGE), Image.LANCZOS)
+    if img.mode not in ("L", "RGB"):
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    logger.info(f"    Re-encoded {len(image_bytes):,} → {buf.tell():,} bytes")
+    with buf.getbuffer() as resized:
+        return base64.b64encode(resized).decode("ascii")
+
+
+def _cache_get(key: str) -> str | None:
+    return cache_get(CACHE_DIR, key, ".txt")
+
+
+def _cache_put(key: str, text: str) -> None:
+    cache_put(CACHE_DIR, key, text, ".txt")
 
 
-def encode_image(image_path: str) -> str:
-    with open(image_path, "rb") as f:
-        return base64.standard_b64encode(f.read()).decode("utf-8")
+def _cache_delete(key: str) -> None:
+    cache_delete(CACHE_DIR, key, ".txt")
 
 
 _PROMPT_FULL = (
@@ -62,44 +115,126 @@ _PROMPT_TEXT_ONLY = (
 )
 
 
-def extract_text_from_page(image_path: str) -> str:
+def _vision_request(image_data: str, prompt: str) -> dict:
+    return {
+        "model":      MODEL,
+        "max_tokens": MAX_TOKENS,
+        "messages": [{
+            "role": "user",
+            "content": [
+                {
+                    "type": "image",
+                    "source": {
+                        "type": "base64",
+                        "media_type": "image/jpeg",
+                        "data": image_data,
+                    },
+                },
+                {"type": "text", "text": prompt},
+            ],
+        }],
+    }
+
+
+def _is_content_filter(e: Exception) -> bool:
+    return "400" in str(e) or "content filtering" in str(e).lower() or "invalid_request_error" in str(e)
+
+
+_PROMPTS = [(_PROMPT_FULL, "full"), (_PROMPT_TEXT_ONLY, "text-only fallback")]
+
+# Part of every cache key, so editing a prompt, the model or any request setting that
+# shapes the transcription invalidates old entries
+PROMPT_VERSION = hashlib.sha256("\0".join([
+    MODEL, _PROMPT_FULL, _PROMPT_TEXT_ONLY, str(MAX_IMAGE_EDGE), str(JPEG_QUALITY), str(MAX_TOKENS),
+]).encode("utf-8")).hexdigest()[:12]
+
+
+def _read_page(image_path: str, refresh: bool = False) -> tuple[bytes, str, str | None]:
+    """Return (image bytes, cache key, cached transcription or None); refresh skips the lookup."""
+    image_bytes = Path(image_path).read_bytes()
+    cache_key   = f"{hashlib.sha256(image_bytes).hexdigest()}_{PROMPT_VERSION}"
+    return image_bytes, cache_key, None if refresh else _cache_get(cache_key)
+
+
+def _async_client() -> anthropic.AsyncAnthropic:
+    """Open a client per event loop, because its connection pool is bound to the running loop."""
+    return anthropic.AsyncAnthropic(
+        http_client=anthropic.DefaultAsyncHttpxClient(http2=_HTTP2),
+        max_retries=MAX_RETRIES,
+    )
+
+
+async def extract_text_from_page_async(async_client: anthropic.AsyncAnthropic, image_path: str,
+                                       refresh: bool = False) -> str:
     """Transcribe all text from a scanned book page via Claude Vision.
 
+    Results are cached by image content hash, so unchanged scans are free on re-runs;
+    refresh=True ignores the cached entry and overwrites it with the new transcription.
     Falls back to a text-only prompt if the default prompt triggers content filtering.
+    Disk reads, hashing, the Pillow resize and cache writes run in worker threads so
+    they overlap with other pages' requests instead of stalling the loop.
     """
-    logger.info(f"  Transcribing: {os.path.basename(image_path)}")
-    image_data = encode_image(image_path)
+    page_name = os.path.basename(image_path)
+    image_bytes, cache_key, cached = await asyncio.to_thread(_read_page, image_path, refresh)
+    if cached is not None:
+        logger.info(f"  Cached: {page_name}")
+        return cached
+
+    logger.info(f"  Transcribing: {page_name}")
+    image_data = await asyncio.to_thread(encode_image_for_claude, image_bytes)
 
-    for prompt, label in [(_PROMPT_FULL, "full"), (_PROMPT_TEXT_ONLY, "text-only fallback")]:
+    for prompt, label in _PROMPTS:
         try:
-            message = client.messages.create(
-                model="claude-sonnet-4-6",
-                max_tokens=2000,
-                messages=[{
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": "image/jpeg",
-                                "data": image_data,
-                            },
-                        },
-                        {"type": "text", "text": prompt},
-                    ],
-                }],
-            )
-            if label != "full":
-                logger.info(f"    Used {label} prompt for {os.path.basename(image_path)}")
-            return message.content[0].text
+            message = await async_client.messages.create(**_vision_request(image_data, prompt))
         except Exception as e:
-            if "400" in str(e) or "content filtering" in str(e).lower() or "invalid_request_error" in str(e):
-                logger.warning(f"  Content filter on {label} prompt — {'trying fallback' if label == 'full' else 'skipping page'}")
-                if label == "text-only fallback":
-                    return "[PAGE BLOCKED BY CONTENT FILTER — text not available]"
-                continue
-            raise
+            if not _is_content_filter(e):
+                raise
+            logger.warning(f"  Content filter on {label} prompt — {'trying fallback' if label == 'full' else 'skipping page'}")
+            continue
+        if label != "full":
+            logger.info(f"    Used {label} prompt for {page_name}")
+        await asyncio.to_thread(_cache_put, cache_key, message.content[0].text)
+        return message.content[0].text
+
+    if refresh:
+        # Otherwise the next non-forced run would serve the old transcription again
+        await asyncio.to_thread(_cache_delete, cache_key)
+    return _BLOCKED_TEXT
+
+
+def extract_text_from_page(image_path: str, refresh: bool = False) -> str:
+    """Synchronous fallback for a single page; runs the async path on a short-lived client."""
+    async def _run() -> str:
+        async with _async_client() as async_client:
+            return await extract_text_from_page_async(async_client, image_path, refresh)
+
+    return asyncio.run(_run())
+
+
+async def transcribe_pages_async(page_paths: list[str], max_concurrency: int = MAX_WORKERS,
+                                 refresh: bool = False) -> list[dict]:
+    """Transcribe every page concurrently on one event loop; returns page dicts in page order."""
+    sem          = asyncio.Semaphore(max_concurrency)
+    async_client = _async_client()
+
+    async def _process_page(page_idx: int, page_path: str) -> dict:
+        async with sem:
+            text = await extract_text_from_page_async(async_client, page_path, refresh)
+        return {
+            "page_num":    page_idx + 1,
+            "source_file": os.path.basename(page_path),
+            "text":        text,
+        }
+
+    async with async_client:
+        # gather preserves input order, so pages come back already sorted
+        return await asyncio.gather(*(_process_page(i, p) for i, p in enumerate(page_paths)))
+
+
+def transcribe_pages(page_paths: list[str], max_concurrency: int = MAX_WORKERS,
+                     refresh: bool = False) -> list[dict]:
+    """Synchronous entry point for ocr.main and pipeline.main."""
+    return asyncio.run(transcribe_pages_async(page_paths, max_concurrency, refresh))
 
 
 def find_pattern_pages(scans_dir: str, pattern_number: int) -> list[str]:
@@ -113,27 +248,46 @@ def find_pattern_pages(scans_dir: str, pattern_number: int) -> list[str]:
     scan_prefix   = f"{pattern_number:03d}_"
     legacy_prefix = f"pattern_{pattern_number}_"
 
-    matched = [
-        f for f in os.listdir(scans_dir)
-        if (f.startswith(scan_prefix) or f.startswith(legacy_prefix))
-        and f.lower().endswith((".jpg", ".jpeg"))
-    ]
+    # Prefix, trailing page index and extension in one compiled match
+    page_re = re.compile(
+        rf"(?:{re.escape(scan_prefix)}|{re.escape(legacy_prefix)})(?:.*_)?(?P<page>[^_]*)(?i:\.jpe?g)"
+    )
+
+    # One lazy directory pass; the names are kept for the error message below
+    present = []
+    matched = []
+    with os.scandir(scans_dir) as it:
+        for entry in it:
+            present.append(entry.name)
+            m = page_re.fullmatch(entry.name)
+            if m and entry.is_file():
+                page = m["page"]
+                matched.append((int(page) if page.isdecimal() else 0, entry.name))
 
     if not matched:
         logger.error(
             f"No files matching '{scan_prefix}*.jpeg' or '{legacy_prefix}*.jpg' in {scans_dir}\n"
-            f"Files present: {os.listdir(scans_dir)}"
+            f"Files present: {present}"
         )
         return []
 
-    def sort_key(fname):
-        stem = Path(fname).stem
-        try:
-            return int(stem.rsplit("_", 1)[-1])
-        except ValueError:
-            return 0
+    return [os.path.join(scans_dir, name) for _, name in sorted(matched, key=lambda m: m[0])]
 
-    return [os.path.join(scans_dir, f) for f in sorted(matched, key=sort_key)]
+
+def find_patterns(scans_dir: str) -> list[tuple[int, str]]:
+    """
+    List the (pattern_number, pattern_name) pairs present in a scans directory.
+    Only the scan format carries a name (076_House_for_a_Small_Family_1.jpeg);
+    legacy pattern_76_1.jpg files are ignored here.
+    """
+    scan_re = re.compile(r"(?P<number>\d{3})_(?P<name>.+)_\d+(?i:\.jpe?g)")
+    found = {}
+    with os.scandir(scans_dir) as it:
+        for entry in it:
+            m = scan_re.fullmatch(entry.name)
+            if m and entry.is_file():
+                found.setdefault(int(m["number"]), m["name"].replace("_", " "))
+    return sorted(found.items())
 
 
 def main():
@@ -152,20 +306,8 @@ def main():
 
     logger.info(f"Found {len(page_paths)} page(s): {[os.path.basename(p) for p in page_paths]}")
 
-    pages    = []
-    all_text = []
-
-    for idx, page_path in enumerate(page_paths):
-        page_num  = idx + 1
-        page_text = extract_text_from_page(page_path)
-        all_text.append(page_text)
-        pages.append({
-            "page_num":    page_num,
-            "source_file": os.path.basename(page_path),
-            "text":        page_text,
-        })
-
-    full_text = "\n\n--- PAGE BREAK ---\n\n".join(all_text)
+    pages     = transcribe_pages(page_paths)
+    full_text = "\n\n--- PAGE BREAK ---\n\n".join(p["text"] for p in pages)
 
     output = {
         "pattern_name":   pattern_name,
@@ -1,20 +1,30 @@
 #!/usr/bin/env python3
 """
-Pipeline orchestrator — chains ocr → extract → (review pause) → upload.
+Pipeline orchestrator — chains ocr → extract → review checklist.
 
 Usage:
-  python scripts/pipeline.py <scans_dir> <pattern_name> <pattern_number> [--auto]
+  python scripts/pipeline.py <scans_dir> <pattern_name> <pattern_number> [--auto] [--force-ocr] [--force-extract]
+  python scripts/pipeline.py --batch <scans_dir> [--force-ocr] [--force-extract]
 
 Options:
-  --auto   Skip the human review pause and upload immediately after extraction.
+  --auto            Skip printing the review checklist after extraction.
+  --batch           OCR + extract every pattern found in <scans_dir>, several patterns at a time.
+                    Patterns that already have a {nnn}_knowledge.json are skipped unless
+                    --force-extract is given. Review the listed knowledge files afterwards.
+  --force-ocr       Re-run OCR even if {nnn}_text.json is newer than every scan, bypassing the
+                    response cache. Implies --force-extract.
+  --force-extract   Re-run extraction even if {nnn}_knowledge.json is newer than {nnn}_text.json,
+                    bypassing the response cache. Overwrites any review edits.
 
 Example:
   python scripts/pipeline.py scans/ "House for a Small Family" 76
   python scripts/pipeline.py scans/ "House for a Small Family" 76 --auto
+  python scripts/pipeline.py --batch scans/
 """
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Allow importing sibling scripts directly
@@ -25,69 +35,181 @@ import extract as extract_mod
 import json
 
 
-def main():
-    if len(sys.argv) < 4:
-        print(__doc__)
-        sys.exit(1)
+def _is_fresh(output_path: str, input_paths: list[str]) -> bool:
+    """True if output_path exists and is at least as new as every input.
+
+    Equal mtimes count as fresh, since a git checkout stamps all of patterns/ alike.
+    """
+    if not os.path.exists(output_path):
+        return False
+    return os.path.getmtime(output_path) >= max(os.path.getmtime(p) for p in input_paths)
+
+
+def _read_json(path: str) -> dict | None:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+# Patterns processed at once in --batch mode; each also runs its pages concurrently
+BATCH_WORKERS = 3
 
-    scans_dir      = sys.argv[1]
-    pattern_name   = sys.argv[2]
-    pattern_number = int(sys.argv[3])
-    auto           = "--auto" in sys.argv
+
+def run_pattern(scans_dir: str, pattern_name: str, pattern_number: int,
+                force_ocr: bool = False, force_extract: bool = False,
+                prefix: str = "") -> tuple[str, bool]:
+    """Run Steps 1–2 for one pattern; returns (knowledge JSON path, whether Step 2 wrote it).
+
+    A prefix such as "[076] " tags every printed line, so output from patterns
+    running in parallel stays attributable; it also drops the banner rules.
+    """
+    def say(msg: str = "") -> None:
+        lines = [line for line in msg.split("\n") if line or not prefix]
+        # One write per message, so concurrent patterns cannot split a line
+        sys.stdout.write("".join(f"{prefix}{line}\n" for line in lines))
+
+    def banner(title: str) -> None:
+        if prefix:
+            say(title)
+        else:
+            say(f"\n{'='*60}\n{title}\n{'='*60}")
 
     # ── Step 1: OCR ──────────────────────────────────────────────────────────
-    print(f"\n{'='*60}")
-    print(f"STEP 1 — OCR: Pattern {pattern_number}: {pattern_name}")
-    print(f"{'='*60}")
+    banner(f"STEP 1 — OCR: Pattern {pattern_number}: {pattern_name}")
 
     page_paths = ocr.find_pattern_pages(scans_dir, pattern_number)
     if not page_paths:
-        print(f"Error: no scan files found for pattern {pattern_number} in {scans_dir}")
-        sys.exit(1)
-
-    pages    = []
-    all_text = []
-    for idx, page_path in enumerate(page_paths):
-        page_num  = idx + 1
-        page_text = ocr.extract_text_from_page(page_path)
-        all_text.append(page_text)
-        pages.append({
-            "page_num":    page_num,
-            "source_file": os.path.basename(page_path),
-            "text":        page_text,
-        })
-
-    full_text = "\n\n--- PAGE BREAK ---\n\n".join(all_text)
-    text_data = {
-        "pattern_name":   pattern_name,
-        "pattern_number": pattern_number,
-        "pages":          pages,
-        "full_text":      full_text,
-    }
+        raise FileNotFoundError(f"no scan files found for pattern {pattern_number} in {scans_dir}")
 
     text_json_path = f"patterns/{pattern_number:03d}_text.json"
-    with open(text_json_path, "w") as f:
-        json.dump(text_data, f, indent=2)
-    print(f"\nOCR complete: {text_json_path}")
+    text_data      = None
+    if not force_ocr and _is_fresh(text_json_path, page_paths):
+        say(f"\nOCR output is newer than all scans, skipping: {text_json_path}")
+        say(f"(Pass --force-ocr to re-run.)")
+    else:
+        pages     = ocr.transcribe_pages(page_paths, refresh=force_ocr)
+        full_text = "\n\n--- PAGE BREAK ---\n\n".join(p["text"] for p in pages)
+        text_data = {
+            "pattern_name":   pattern_name,
+            "pattern_number": pattern_number,
+            "pages":          pages,
+            "full_text":      full_text,
+        }
+
+        # Leave an identical file untouched: bumping its mtime would make a reviewed
+        # knowledge JSON look stale and get replaced by a cached pre-review extraction
+        if _read_json(text_json_path) == text_data:
+            say(f"\nOCR complete, output unchanged: {text_json_path}")
+        else:
+            with open(text_json_path, "w") as f:
+                json.dump(text_data, f, indent=2)
+            say(f"\nOCR complete: {text_json_path}")
 
     # ── Step 2: Extract ───────────────────────────────────────────────────────
+    banner(f"STEP 2 — Extract knowledge: Pattern {pattern_number}")
+
+    knowledge_json_path = f"patterns/{pattern_number:03d}_knowledge.json"
+    extracted           = False
+    if not force_extract and _is_fresh(knowledge_json_path, [text_json_path]):
+        # Also protects hand edits made at the review checkpoint of an earlier run
+        say(f"\nKnowledge JSON is newer than {text_json_path}, skipping: {knowledge_json_path}")
+        say(f"(Pass --force-extract to re-run.)")
+    else:
+        # Hand over the OCR result in memory when Step 1 just produced it
+        if text_data is not None:
+            knowledge = extract_mod.extract_knowledge_from_data(text_data, source=text_json_path,
+                                                                refresh=force_extract)
+        else:
+            knowledge = extract_mod.extract_knowledge(text_json_path, refresh=force_extract)
+
+        with open(knowledge_json_path, "w") as f:
+            json.dump(knowledge, f, indent=2)
+        extracted = True
+        say(f"\nExtraction complete: {knowledge_json_path}")
+
+    return knowledge_json_path, extracted
+
+
+def run_batch(scans_dir: str, force_ocr: bool = False, force_extract: bool = False) -> None:
+    """Run Steps 1–2 for every pattern in scans_dir, BATCH_WORKERS patterns at a time.
+
+    Each pattern is network-bound on Claude, so threads are enough to overlap them.
+    Per-pattern lines are tagged [NNN]; only the final summary is unprefixed.
+    Patterns that already have a knowledge JSON are left alone unless force_extract is set,
+    so curated files are never replaced by a bulk run.
+    """
+    patterns = ocr.find_patterns(scans_dir)
+    if not patterns:
+        print(f"Error: no named scan files (NNN_Pattern_Name_N.jpeg) found in {scans_dir}")
+        sys.exit(1)
+
+    skipped = []
+    if not force_extract:
+        skipped  = [n for n, _ in patterns if os.path.exists(f"patterns/{n:03d}_knowledge.json")]
+        patterns = [(n, name) for n, name in patterns if n not in skipped]
+        for number in skipped:
+            print(f"[{number:03d}] knowledge JSON exists, skipping (pass --force-extract to re-run)")
+
+    done, failed = [], []
+    with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as ex:
+        futures = {
+            ex.submit(run_pattern, scans_dir, name, number, force_ocr, force_extract, f"[{number:03d}] "): number
+            for number, name in patterns
+        }
+        for fut in as_completed(futures):
+            try:
+                done.append(fut.result()[0])
+            except Exception as e:
+                failed.append(futures[fut])
+                print(f"[{futures[fut]:03d}] failed: {e}")
+
     print(f"\n{'='*60}")
-    print(f"STEP 2 — Extract knowledge")
+    print(f"BATCH COMPLETE — {len(done)} ok, {len(skipped)} skipped, {len(failed)} failed")
     print(f"{'='*60}")
+    for path in sorted(done):
+        print(f"  review: {path}")
+    if failed:
+        print(f"  failed patterns: {sorted(failed)}")
+        sys.exit(1)
 
-    knowledge = extract_mod.extract_knowledge(text_json_path)
 
-    knowledge_json_path = f"patterns/{pattern_number:03d}_knowledge.json"
-    with open(knowledge_json_path, "w") as f:
-        json.dump(knowledge, f, indent=2)
-    print(f"\nExtraction complete: {knowledge_json_path}")
+def main():
+    force_ocr     = "--force-ocr" in sys.argv
+    force_extract = "--force-extract" in sys.argv or force_ocr
+    args          = [a for a in sys.argv[1:] if not a.startswith("--")]
+
+    if "--batch" in sys.argv:
+        if len(args) < 1:
+            print(__doc__)
+            sys.exit(1)
+        run_batch(args[0], force_ocr, force_extract)
+        return
+
+    if len(args) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    scans_dir      = args[0]
+    pattern_name   = args[1]
+    pattern_number = int(args[2])
+    auto           = "--auto" in sys.argv
 
-    # ── Review pause ──────────────────────────────────────────────────────────
+    try:
+        knowledge_json_path, extracted = run_pattern(scans_dir, pattern_name, pattern_number, force_ocr, force_extract)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # ── Review checkpoint ────────────────────────────────────────────────────
     if not auto:
         print(f"\n{'='*60}")
         print(f"REVIEW CHECKPOINT")
         print(f"{'='*60}")
-        print(f"Knowledge JSON written to: {knowledge_json_path}")
+        if extracted:
+            print(f"Knowledge JSON written to: {knowledge_json_path}")
+        else:
+            print(f"Knowledge JSON up to date, existing file kept: {knowledge_json_path}")
         print(f"\nReview checklist:")
         print(f"  [ ] Problem statement is verbatim, not a summary")
         print(f"  [ ] Solution statement is the 'Therefore:' directive")
@@ -97,31 +219,7 @@ def main():
         print(f"  [ ] adjacency_rules captures numbered cross-references")
         print(f"  [ ] failure_modes describe failure, not re-state the rule")
         print(f"  [ ] JSON is valid")
-        print(f"\nEdit {knowledge_json_path} if needed, then press Enter to upload.")
-        print(f"(Ctrl+C to abort without uploading.)\n")
-        try:
-            input("Press Enter to continue to upload > ")
-        except KeyboardInterrupt:
-            print("\nAborted. Run upload manually:")
-            print(f"  python scripts/upload.py {knowledge_json_path}")
-            sys.exit(0)
-
-    # ── Step 3: Upload ────────────────────────────────────────────────────────
-    print(f"\n{'='*60}")
-    print(f"STEP 3 — Upload to Notion")
-    print(f"{'='*60}")
-
-    # Import upload here to avoid crashing if env vars aren't set during OCR/extract
-    import upload as upload_mod
-    upload_mod.main.__module__  # trigger import check
-
-    # Re-invoke upload.main with the knowledge path as argv
-    original_argv = sys.argv[:]
-    sys.argv = ["upload.py", knowledge_json_path]
-    try:
-        upload_mod.main()
-    finally:
-        sys.argv = original_argv
+        print(f"\nEdit {knowledge_json_path} if needed, then reload visualize.html.")
 
 
 if __name__ == "__main__":